@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Harness de carga: roda o `main()` de relatorio_imoveis.py inteiro contra o
+servidor_fake.py local e mede vazão, latência de cauda e pico de memória.
+
+O servidor sobe em um subprocesso, então o pico de memória medido (tracemalloc)
+é só o do pipeline de scraping + simulação + exportação.
+
+Uso:
+    python3 carga.py
+    python3 carga.py --imoveis 20000 --por-pagina 20000 --latencia 50 --jitter 100
+    python3 carga.py --imoveis 5000 --erro 0.1 --lento 0.05 --atraso-lento 3000 --export csv
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import relatorio_imoveis as rel  # noqa: E402
+import servidor_fake  # noqa: E402
+
+
+def percentil(valores: list[float], p: float) -> float:
+    """Percentil por posto mais próximo (valores já ordenados)."""
+    if not valores:
+        return 0.0
+    k = max(0, min(len(valores) - 1, math.ceil(p / 100 * len(valores)) - 1))
+    return valores[k]
+
+
+@contextlib.contextmanager
+def servidor(argv: list[str]):
+    """Sobe servidor_fake.py em subprocesso numa porta livre e devolve a URL base."""
+    proc = subprocess.Popen(
+        [sys.executable, servidor_fake.__file__, "--porta", "0", *argv],
+        stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        base = proc.stdout.readline().strip()
+        if not base:
+            raise RuntimeError("servidor_fake.py não iniciou")
+        yield base
+    finally:
+        proc.terminate()
+        proc.wait(timeout=5)
+
+
+@contextlib.contextmanager
+def medir_http(latencias: list[float], erros: list[str]):
+    """Envolve http_get/http_post do módulo para registrar latência e falhas."""
+    originais = rel.http_get, rel.http_post
+
+    def cronometrado(fn):
+        def wrapper(url, *args, **kwargs):
+            t0 = time.perf_counter()
+            resp = fn(url, *args, **kwargs)
+            latencias.append(time.perf_counter() - t0)
+            if resp is None:
+                erros.append(url)
+            return resp
+        return wrapper
+
+    rel.http_get, rel.http_post = cronometrado(rel.http_get), cronometrado(rel.http_post)
+    try:
+        yield
+    finally:
+        rel.http_get, rel.http_post = originais
+
+
+def rodar(export: str, extra: list[str]) -> tuple[float, int, str]:
+    """Executa rel.main() uma vez; retorna (segundos, pico de bytes, saída)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        saida = os.path.join(tmp, f"saida.{export}")
+        argv_original = sys.argv
+        sys.argv = ["relatorio_imoveis.py", "--export", export, "--output", saida, *extra]
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                rel.main()
+        finally:
+            elapsed = time.perf_counter() - t0
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            sys.argv = argv_original
+        return elapsed, pico, Path(saida).read_text(encoding="utf-8")
+
+
+def contar_imoveis(export: str, saida: str) -> int:
+    if export == "json":
+        return json.loads(saida)["resumo"]["total_imoveis"]
+    if export == "ndjson":
+        return len(saida.splitlines())
+    if export == "csv":
+        return len(saida.split("\n\n")[0].splitlines()) - 1
+    return -1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga end-to-end do scraper contra o servidor fake local")
+    servidor_fake.add_config_args(parser)
+    parser.add_argument("--export", choices=["texto", "csv", "json", "ndjson"], default="json", help="Formato de saída do main() (default: json)")
+    parser.add_argument("--repeticoes", type=int, default=1, help="Execuções completas de main() (default: 1)")
+    args, extra = parser.parse_known_args()
+
+    server_argv = [
+        "--imoveis", str(args.imoveis), "--latencia", str(args.latencia),
+        "--jitter", str(args.jitter), "--erro", str(args.erro), "--lento", str(args.lento),
+        "--atraso-lento", str(args.atraso_lento), "--seed", str(args.seed),
+    ]
+    if args.por_pagina:
+        server_argv += ["--por-pagina", str(args.por_pagina)]
+
+    urls_originais = dict(rel.URLS)
+    with servidor(server_argv) as base:
+        rel.URLS.update(servidor_fake.urls_locais(base))
+        print(f"Servidor fake em {base} ({args.imoveis} imóveis por fonte/finalidade)\n")
+        print(f"{'#':>2} | {'Tempo':>8} | {'Imóveis':>8} | {'Imóveis/s':>10} | {'Req':>4} | {'Erros':>5} | "
+              f"{'p50':>8} | {'p95':>8} | {'p99':>8} | {'Máx':>8} | {'Pico mem':>9}")
+        print(f"{'─'*2}-+-{'─'*8}-+-{'─'*8}-+-{'─'*10}-+-{'─'*4}-+-{'─'*5}-+-"
+              f"{'─'*8}-+-{'─'*8}-+-{'─'*8}-+-{'─'*8}-+-{'─'*9}")
+        try:
+            for n in range(1, args.repeticoes + 1):
+                latencias, erros = [], []
+                with medir_http(latencias, erros):
+                    elapsed, pico, saida = rodar(args.export, extra)
+                total = contar_imoveis(args.export, saida)
+                lat = sorted(latencias)
+                ms = lambda v: f"{v * 1000:>6.0f}ms"
+                vazao = f"{total / elapsed:>10,.0f}" if total >= 0 else f"{'-':>10}"
+                print(f"{n:>2} | {elapsed:>7.2f}s | {total:>8} | {vazao} | {len(lat):>4} | {len(erros):>5} | "
+                      f"{ms(percentil(lat, 50))} | {ms(percentil(lat, 95))} | {ms(percentil(lat, 99))} | "
+                      f"{ms(lat[-1] if lat else 0)} | {pico / 2**20:>7.1f}MB")
+        finally:
+            rel.URLS.clear()
+            rel.URLS.update(urls_originais)
+
+
+if __name__ == "__main__":
+    main()
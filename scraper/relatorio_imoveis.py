@@ -7,19 +7,33 @@ Uso:
     python3 relatorio_imoveis.py
     python3 relatorio_imoveis.py --preco 600000 --aluguel 2500 --entrada 0.3 --juros 0.10
     python3 relatorio_imoveis.py --amortizacao 0.5
+    python3 relatorio_imoveis.py --sistema sac
     python3 relatorio_imoveis.py --export csv
+    python3 relatorio_imoveis.py --export ndjson --output imoveis.ndjson
+    python3 relatorio_imoveis.py --exportar json=dados.json --exportar csv=dados.csv --exportar texto=relatorio.txt
+    python3 relatorio_imoveis.py --backfill --docs-dir ../docs
+    python3 relatorio_imoveis.py --profile --export json --output /dev/null
 """
 
 import argparse
+import contextlib
+import cProfile
 import json
+import math
 import os
+import pstats
 import re
 import shutil
 import sys
+import time
+import tracemalloc
+import unicodedata
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional, TextIO
 import urllib.request
 import urllib.parse
 import urllib.error
@@ -59,6 +73,15 @@ class Imovel:
             "endereco": self.endereco,
         }
 
+    @classmethod
+    def from_dict(cls, d: dict) -> "Imovel":
+        """Inverso de to_dict (ignora o campo derivado preco_m2)."""
+        return cls(
+            area=d["area"], quartos=d["quartos"], banheiros=d["banheiros"], vagas=d["vagas"],
+            preco=d["preco"], tipo=d["tipo"], fonte=d["fonte"],
+            bairro=d.get("bairro", "Bom Pastor"), endereco=d.get("endereco", ""),
+        )
+
 
 # ─────────────────────────────────────────────────────────────
 # HTTP Helper
@@ -104,7 +127,16 @@ def http_post(url: str, data: dict, timeout: int = 15) -> Optional[dict]:
 # Scrapers
 # ─────────────────────────────────────────────────────────────
 
-def scrape_ala_imoveis(finalidade: str, bairro_codigos: str = "7,358") -> list[Imovel]:
+# Endpoints de cada imobiliária (sobrescritos pelo harness de carga local)
+URLS = {
+    "ala": "https://www.alaimoveis.com.br/imoveis/ajax/",
+    "achei": "https://www.acheiimobiliaria.com/imoveis/ajax/",
+    "francisco": "https://franciscoimoveis.com.br/imoveis/{tipo_url}/casa/divinopolis/bom-pastor/1/",
+    "mgf": "https://www.mgfimoveis.com.br/{finalidade}/casa/mg-divinopolis-bom-pastor",
+}
+
+
+def scrape_ala_imoveis(finalidade: str, bairro_codigos: str = "7,358") -> Iterator[Imovel]:
     """Ala Imóveis — API JSON via POST /imoveis/ajax/"""
     print(f"  Ala Imóveis ({finalidade})...")
     data = {
@@ -128,11 +160,11 @@ def scrape_ala_imoveis(finalidade: str, bairro_codigos: str = "7,358") -> list[I
         "imovel[codigocidade]": "0",
         "imovel[codigoregiao]": "0",
     }
-    resp = http_post("https://www.alaimoveis.com.br/imoveis/ajax/", data)
+    resp = http_post(URLS["ala"], data)
     if not resp or "lista" not in resp:
-        return []
+        return
 
-    imoveis = []
+    encontrados = 0
     for item in resp["lista"]:
         if "Casa" not in item.get("tipo", ""):
             continue
@@ -140,7 +172,8 @@ def scrape_ala_imoveis(finalidade: str, bairro_codigos: str = "7,358") -> list[I
         preco = float(re.sub(r"[^\d,]", "", preco_str).replace(",", "."))
         area_str = item.get("areaprincipal", "0")
         area = float(area_str.replace(",", ".")) if area_str else 0
-        imoveis.append(Imovel(
+        encontrados += 1
+        yield Imovel(
             area=area,
             quartos=int(item.get("numeroquartos", 0)),
             banheiros=int(item.get("numerobanhos", 0)),
@@ -149,12 +182,11 @@ def scrape_ala_imoveis(finalidade: str, bairro_codigos: str = "7,358") -> list[I
             tipo=finalidade,
             fonte="Ala Imóveis",
             endereco=item.get("endereco", ""),
-        ))
-    print(f"    → {len(imoveis)} casas encontradas")
-    return imoveis
+        )
+    print(f"    → {encontrados} casas encontradas")
 
 
-def scrape_achei_imobiliaria(finalidade: str, bairro_codigo: str = "12") -> list[Imovel]:
+def scrape_achei_imobiliaria(finalidade: str, bairro_codigo: str = "12") -> Iterator[Imovel]:
     """Achei Imobiliária — mesma API da Ala (mesma plataforma)"""
     print(f"  Achei Imobiliária ({finalidade})...")
     data = {
@@ -178,11 +210,11 @@ def scrape_achei_imobiliaria(finalidade: str, bairro_codigo: str = "12") -> list
         "imovel[codigocidade]": "0",
         "imovel[codigoregiao]": "0",
     }
-    resp = http_post("https://www.acheiimobiliaria.com/imoveis/ajax/", data)
+    resp = http_post(URLS["achei"], data)
     if not resp or "lista" not in resp:
-        return []
+        return
 
-    imoveis = []
+    encontrados = 0
     for item in resp["lista"]:
         if "Casa" not in item.get("tipo", ""):
             continue
@@ -190,7 +222,8 @@ def scrape_achei_imobiliaria(finalidade: str, bairro_codigo: str = "12") -> list
         preco = float(re.sub(r"[^\d,]", "", preco_str).replace(",", "."))
         area_str = item.get("areaprincipal", "0")
         area = float(area_str.replace(",", ".")) if area_str else 0
-        imoveis.append(Imovel(
+        encontrados += 1
+        yield Imovel(
             area=area,
             quartos=int(item.get("numeroquartos", 0)),
             banheiros=int(item.get("numerobanhos", 0)),
@@ -199,21 +232,20 @@ def scrape_achei_imobiliaria(finalidade: str, bairro_codigo: str = "12") -> list
             tipo=finalidade,
             fonte="Achei Imobiliária",
             endereco=item.get("endereco", ""),
-        ))
-    print(f"    → {len(imoveis)} casas encontradas")
-    return imoveis
+        )
+    print(f"    → {encontrados} casas encontradas")
 
 
-def scrape_francisco_imoveis(finalidade: str) -> list[Imovel]:
+def scrape_francisco_imoveis(finalidade: str) -> Iterator[Imovel]:
     """Francisco Imóveis — scraping HTML direto"""
     tipo_url = "comprar" if finalidade == "venda" else "alugar"
-    url = f"https://franciscoimoveis.com.br/imoveis/{tipo_url}/casa/divinopolis/bom-pastor/1/"
+    url = URLS["francisco"].format(tipo_url=tipo_url)
     print(f"  Francisco Imóveis ({finalidade})...")
     html = http_get(url)
     if not html:
-        return []
+        return
 
-    imoveis = []
+    encontrados = 0
     # Parse listing cards from HTML
     # Pattern: data with area, quartos, vagas, preco
     cards = re.findall(
@@ -253,26 +285,26 @@ def scrape_francisco_imoveis(finalidade: str) -> list[Imovel]:
                 q = int(quartos[i]) if i < len(quartos) else 0
                 v = int(vagas[i]) if i < len(vagas) else 0
                 if area > 0 and preco > 0:
-                    imoveis.append(Imovel(
+                    encontrados += 1
+                    yield Imovel(
                         area=area, quartos=q, banheiros=0, vagas=v,
                         preco=preco, tipo=finalidade, fonte="Francisco Imóveis",
-                    ))
+                    )
             except (ValueError, IndexError):
                 continue
 
-    print(f"    → {len(imoveis)} casas encontradas")
-    return imoveis
+    print(f"    → {encontrados} casas encontradas")
 
 
-def scrape_mgf_imoveis(finalidade: str) -> list[Imovel]:
+def scrape_mgf_imoveis(finalidade: str) -> Iterator[Imovel]:
     """MGF Imóveis — scraping HTML"""
-    url = f"https://www.mgfimoveis.com.br/{finalidade}/casa/mg-divinopolis-bom-pastor"
+    url = URLS["mgf"].format(finalidade=finalidade)
     print(f"  MGF Imóveis ({finalidade})...")
     html = http_get(url)
     if not html:
-        return []
+        return
 
-    imoveis = []
+    encontrados = 0
     # Extract listing blocks
     blocks = re.split(r'class="[^"]*card[^"]*"', html)
 
@@ -293,37 +325,99 @@ def scrape_mgf_imoveis(finalidade: str) -> list[Imovel]:
             v = int(vagas_raw[i]) if i < len(vagas_raw) else 0
             # Filter reasonable values
             if finalidade == "aluguel" and 500 < preco < 20000:
-                imoveis.append(Imovel(area=area, quartos=q, banheiros=b, vagas=v,
-                                      preco=preco, tipo=finalidade, fonte="MGF Imóveis"))
+                encontrados += 1
+                yield Imovel(area=area, quartos=q, banheiros=b, vagas=v,
+                             preco=preco, tipo=finalidade, fonte="MGF Imóveis")
             elif finalidade == "venda" and preco > 50000:
-                imoveis.append(Imovel(area=area, quartos=q, banheiros=b, vagas=v,
-                                      preco=preco, tipo=finalidade, fonte="MGF Imóveis"))
+                encontrados += 1
+                yield Imovel(area=area, quartos=q, banheiros=b, vagas=v,
+                             preco=preco, tipo=finalidade, fonte="MGF Imóveis")
         except (ValueError, IndexError):
             continue
 
-    print(f"    → {len(imoveis)} casas encontradas")
-    return imoveis
+    print(f"    → {encontrados} casas encontradas")
 
 
 # ─────────────────────────────────────────────────────────────
 # Scrape All
 # ─────────────────────────────────────────────────────────────
 
-def scrape_todos() -> list[Imovel]:
-    """Scrape all sources for both aluguel and venda."""
+def scrape_todos() -> Iterator[Imovel]:
+    """Scrape all sources for both aluguel and venda, yielding as each response is parsed."""
     print("\n🔍 Coletando dados de imobiliárias...\n")
-    todos = []
 
     for finalidade in ["aluguel", "venda"]:
-        todos += scrape_ala_imoveis(finalidade)
-        todos += scrape_achei_imobiliaria(finalidade)
-        todos += scrape_francisco_imoveis(finalidade)
-        todos += scrape_mgf_imoveis(finalidade)
+        yield from scrape_ala_imoveis(finalidade)
+        yield from scrape_achei_imobiliaria(finalidade)
+        yield from scrape_francisco_imoveis(finalidade)
+        yield from scrape_mgf_imoveis(finalidade)
+
+
+# ─────────────────────────────────────────────────────────────
+# Pipeline
+# ─────────────────────────────────────────────────────────────
+
+@dataclass
+class Resumo:
+    """Contadores acumulados à medida que os imóveis passam pelo pipeline."""
+    total_imoveis: int = 0
+    total_venda: int = 0
+    total_aluguel: int = 0
+    fontes: set = field(default_factory=set)
+
+    def contar(self, imoveis: Iterable[Imovel]) -> Iterator[Imovel]:
+        for i in imoveis:
+            self.total_imoveis += 1
+            if i.tipo == "venda":
+                self.total_venda += 1
+            elif i.tipo == "aluguel":
+                self.total_aluguel += 1
+            self.fontes.add(i.fonte)
+            yield i
+
+    def imprimir(self):
+        print(f"\n✅ Total coletado: {self.total_imoveis} imóveis")
+        print(f"   Aluguel: {self.total_aluguel}")
+        print(f"   Venda:   {self.total_venda}")
+
+    def to_dict(self) -> dict:
+        return {
+            "total_imoveis": self.total_imoveis,
+            "total_venda": self.total_venda,
+            "total_aluguel": self.total_aluguel,
+            "fontes": sorted(self.fontes),
+        }
 
-    print(f"\n✅ Total coletado: {len(todos)} imóveis")
-    print(f"   Aluguel: {len([i for i in todos if i.tipo == 'aluguel'])}")
-    print(f"   Venda:   {len([i for i in todos if i.tipo == 'venda'])}")
-    return todos
+
+def normalizar(imoveis: Iterable[Imovel]) -> Iterator[Imovel]:
+    """Remove espaços redundantes dos campos de texto."""
+    for i in imoveis:
+        i.endereco = " ".join(i.endereco.split())
+        i.bairro = i.bairro.strip()
+        yield i
+
+
+def filtrar(imoveis: Iterable[Imovel]) -> Iterator[Imovel]:
+    """Descarta anúncios sem preço (ex.: "Consulte")."""
+    for i in imoveis:
+        if i.preco > 0:
+            yield i
+
+
+def coletar(resumo: Resumo) -> Iterator[Imovel]:
+    """scrape_todos → normalizar → filtrar, contabilizando em `resumo`."""
+    return resumo.contar(filtrar(normalizar(scrape_todos())))
+
+
+def escrever_ndjson(imoveis: Iterable[Imovel], f: TextIO, flush: bool = False):
+    """
+    Escreve um imóvel por linha. Com `flush`, libera cada linha assim que
+    chega (stdout lido por outro processo); em arquivo fica o buffer normal.
+    """
+    for i in imoveis:
+        f.write(json.dumps(i.to_dict(), ensure_ascii=False) + "\n")
+        if flush:
+            f.flush()
 
 
 # ─────────────────────────────────────────────────────────────
@@ -360,32 +454,142 @@ PROJECAO = [
 ]
 
 
+SISTEMAS = {"price": "Price", "sac": "SAC"}
+
+QUITADO = 0.005  # saldo abaixo de meio centavo conta como quitado
+
+
+@dataclass
+class Financiamento:
+    """
+    Saldo, juros e pagamentos em forma fechada para Price e SAC.
+
+    Price: prestação fixa; SAC: amortização fixa com juros sobre o saldo.
+    `amort_extra` é somado à amortização todo mês. Fórmulas válidas até o
+    mês de quitação (saldo pode ficar negativo no último mês).
+    """
+    financiado: float
+    tx_m: float
+    sistema: str = "price"
+    prazo: int = 360
+    amort_extra: float = 0.0
+
+    @cached_property
+    def parcela(self) -> float:
+        """Primeira prestação (fixa no Price), sem a amortização extra."""
+        if self.sistema == "sac":
+            return self.financiado / self.prazo + self.financiado * self.tx_m
+        q = (1 + self.tx_m) ** self.prazo
+        return self.financiado * (self.tx_m * q) / (q - 1)
+
+    @property
+    def amortizacao_sac(self) -> float:
+        return self.financiado / self.prazo + self.amort_extra
+
+    @property
+    def decrescimo(self) -> float:
+        """Queda mensal do pagamento total (0 no Price, juros da amortização no SAC)."""
+        return self.tx_m * self.amortizacao_sac if self.sistema == "sac" else 0.0
+
+    def prestacao(self, k: int) -> float:
+        """Prestação do mês k (1..prazo), sem a amortização extra; 0 após o prazo."""
+        if k > self.prazo:
+            return 0.0
+        if self.sistema == "sac":
+            return self.parcela - (k - 1) * self.tx_m * self.financiado / self.prazo
+        return self.parcela
+
+    def saldo(self, k: int) -> float:
+        """Saldo devedor após k meses."""
+        if self.sistema == "sac":
+            return self.financiado - k * self.amortizacao_sac
+        q = (1 + self.tx_m) ** k
+        return self.financiado * q - (self.parcela + self.amort_extra) * (q - 1) / self.tx_m
+
+    def juros_ate(self, k: int) -> float:
+        """Juros acumulados nos meses 1..k."""
+        if self.sistema == "sac":
+            return self.tx_m * (k * self.financiado - self.amortizacao_sac * k * (k - 1) / 2)
+        # Σ saldo·r = Σ (saldo_j − saldo_{j−1} + pagamento)
+        return k * (self.parcela + self.amort_extra) + self.saldo(k) - self.financiado
+
+    def pago_ate(self, k: int) -> float:
+        """Pagamentos acumulados (prestações + amortização extra) nos meses 1..k."""
+        if self.sistema == "sac":
+            return k * self.amortizacao_sac + self.juros_ate(k)
+        return k * (self.parcela + self.amort_extra)
+
+    def passo_anual(self) -> tuple[float, float]:
+        """(fator, passo) tais que saldo(k + 12) = saldo(k) * fator + passo."""
+        if self.sistema == "sac":
+            return 1.0, -12 * self.amortizacao_sac
+        q = (1 + self.tx_m) ** 12
+        return q, -(self.parcela + self.amort_extra) * (q - 1) / self.tx_m
+
+    def mes_quitacao(self) -> Optional[int]:
+        """Primeiro mês com saldo quitado, ou None se os pagamentos não cobrem os juros."""
+        if self.financiado <= QUITADO:
+            return 0  # entrada de 100%: nada a financiar
+        if self.sistema == "sac":
+            k = math.ceil(self.financiado / self.amortizacao_sac)
+        else:
+            pagamento = self.parcela + self.amort_extra
+            if pagamento <= self.financiado * self.tx_m:
+                return None
+            k = math.ceil(math.log(pagamento / (pagamento - self.financiado * self.tx_m))
+                          / math.log(1 + self.tx_m))
+        # Corrige arredondamento de ponto flutuante na fronteira
+        while k > 1 and self.saldo(k - 1) <= QUITADO:
+            k -= 1
+        while self.saldo(k) > QUITADO:
+            k += 1
+        return k
+
+
+def _capitalizar(valor: float, taxa: float, n: int, aporte: float, gradiente: float = 0.0) -> float:
+    """
+    Valor após n meses rendendo `taxa`, com aportes no fim de cada mês de
+    aporte, aporte + gradiente, aporte + 2·gradiente, ...
+    """
+    if taxa == 0:
+        return valor + n * aporte + gradiente * n * (n - 1) / 2
+    q = (1 + taxa) ** n
+    anuidade = (q - 1) / taxa
+    return valor * q + aporte * anuidade + gradiente * (anuidade - n) / taxa
+
+
 def simular(preco: float, aluguel_ini: float, entrada_pct: float,
-            taxa_financ: float, amort_extra_pct: float) -> dict:
+            taxa_financ: float, amort_extra_pct: float, sistema: str = "price") -> dict:
     """
     Simula 30 anos de compra (com e sem amortização) vs aluguel.
     Usa dados históricos 2010-2025 + projeção cíclica 2026-2039.
+    Avança ano a ano em forma fechada (ver `Financiamento`); no SAC a sobra
+    entre o orçamento e a prestação decrescente é investida pelo comprador.
     """
     entrada = preco * entrada_pct
     financiado = preco * (1 - entrada_pct)
     tx_m = taxa_financ / 12
     prazo = 360
-    parcela = financiado * (tx_m * (1 + tx_m) ** prazo) / ((1 + tx_m) ** prazo - 1)
+    parcela = Financiamento(financiado, tx_m, sistema, prazo).parcela
     amort_extra = parcela * amort_extra_pct
     orcamento = parcela + amort_extra
 
     dados = HISTORICO + PROJECAO
+    horizonte = len(dados) * 12
 
     # ── Cenário 1: Comprar COM amortização extra ──
+    fin_com = Financiamento(financiado, tx_m, sistema, prazo, amort_extra)
+    quit_com = min(fin_com.mes_quitacao() or horizonte + 1, horizonte + 1)
+    fator_com, passo_com = fin_com.passo_anual()
+    decrescimo = fin_com.decrescimo
     saldo_com = financiado
     patrim_comprador = 0.0
-    total_juros_com = 0.0
-    total_pago_com = entrada
-    meses_quitou = 0
 
     # ── Cenário 2: Comprar SEM amortização ──
+    fin_sem = Financiamento(financiado, tx_m, sistema, prazo)
+    quit_sem = min(fin_sem.mes_quitacao() or horizonte + 1, horizonte + 1)
+    fator_sem, passo_sem = fin_sem.passo_anual()
     saldo_sem = financiado
-    total_juros_sem = 0.0
 
     # ── Cenário 3: Alugar + investir ──
     patrim_inquilino = entrada
@@ -398,49 +602,56 @@ def simular(preco: float, aluguel_ini: float, entrada_pct: float,
 
     for idx, (year, ipca, selic) in enumerate(dados):
         ano = idx + 1
-        selic_m = (1 + selic / 100) ** (1 / 12) - 1
-
-        for m in range(12):
-            # Comprador COM amortização
-            if saldo_com > 0:
-                juros = saldo_com * tx_m
-                amort_normal = parcela - juros
-                total_juros_com += juros
-                saldo_com -= (amort_normal + amort_extra)
-                total_pago_com += parcela + amort_extra
-                if saldo_com <= 0:
-                    saldo_com = 0
-                    meses_quitou = (ano - 1) * 12 + m + 1
-            else:
-                patrim_comprador = patrim_comprador * (1 + selic_m) + orcamento
-
-            # Comprador SEM amortização
-            if saldo_sem > 0:
-                juros_sem = saldo_sem * tx_m
-                total_juros_sem += juros_sem
-                saldo_sem -= (parcela - juros_sem)
-
-            # Inquilino
-            investimento = orcamento - aluguel
-            patrim_inquilino = patrim_inquilino * (1 + selic_m) + investimento
-            total_aluguel += aluguel
+        fator = 1 + selic / 100  # (1 + selic_m) ** 12
+        selic_m = fator ** (1 / 12) - 1
+        anuidade = (fator - 1) / selic_m  # Σ (1 + selic_m) ** j, j = 0..11
+        ini = idx * 12
+
+        # Comprador COM amortização: investe a sobra enquanto paga, o orçamento todo depois
+        if quit_com >= ini + 12:
+            patrim_comprador = (patrim_comprador * fator
+                                + decrescimo * (ini * anuidade + (anuidade - 12) / selic_m))
+        elif quit_com <= ini:
+            patrim_comprador = patrim_comprador * fator + orcamento * anuidade
+        else:
+            pagando = quit_com - ini
+            patrim_comprador = _capitalizar(patrim_comprador, selic_m, pagando,
+                                            decrescimo * ini, decrescimo)
+            patrim_comprador = _capitalizar(patrim_comprador, selic_m, 12 - pagando, orcamento)
+        saldo_com = max(saldo_com * fator_com + passo_com, 0.0)
+
+        # Comprador SEM amortização
+        saldo_sem = max(saldo_sem * fator_sem + passo_sem, 0.0)
+
+        # Inquilino
+        patrim_inquilino = patrim_inquilino * fator + (orcamento - aluguel) * anuidade
+        total_aluguel += 12 * aluguel
 
         aluguel *= (1 + ipca / 100)
         imovel_val *= (1 + ipca / 100)
 
-        if crossover is None and aluguel > parcela:
+        # Prestação no último mês do ano (decrescente no SAC)
+        prestacao = fin_sem.prestacao(ini + 12)
+        if crossover is None and aluguel > prestacao:
             crossover = ano
 
         historico_anual.append({
             "ano": ano, "year": year, "ipca": ipca, "selic": selic,
             "aluguel": round(aluguel, 2),
-            "saldo_com": round(max(saldo_com, 0), 2),
-            "saldo_sem": round(max(saldo_sem, 0), 2),
+            "parcela": round(prestacao, 2),
+            "saldo_com": round(saldo_com, 2),
+            "saldo_sem": round(saldo_sem, 2),
             "patrim_comprador": round(patrim_comprador, 2),
             "patrim_inquilino": round(patrim_inquilino, 2),
             "imovel_val": round(imovel_val, 2),
         })
 
+    meses_com = min(quit_com, horizonte)
+    meses_quitou = quit_com if quit_com <= horizonte else 0
+    total_juros_com = fin_com.juros_ate(meses_com)
+    total_pago_com = entrada + fin_com.pago_ate(meses_com)
+    total_juros_sem = fin_sem.juros_ate(min(quit_sem, horizonte))
+
     avg_selic = sum(d[2] for d in dados) / 30
     avg_ipca = sum(d[1] for d in dados) / 30
 
@@ -451,6 +662,7 @@ def simular(preco: float, aluguel_ini: float, entrada_pct: float,
             "entrada_valor": entrada,
             "financiado": financiado,
             "taxa_financ": taxa_financ,
+            "sistema": sistema,
             "parcela": round(parcela, 2),
             "amort_extra_pct": amort_extra_pct,
             "amort_extra_valor": round(amort_extra, 2),
@@ -491,6 +703,11 @@ def simular(preco: float, aluguel_ini: float, entrada_pct: float,
 # Report Generation
 # ─────────────────────────────────────────────────────────────
 
+def rotulo_parcela(p: dict) -> str:
+    """No SAC `parametros.parcela` é só a primeira prestação."""
+    return "1ª parcela" if p.get("sistema") == "sac" else "Parcela"
+
+
 def gerar_relatorio_texto(imoveis: list[Imovel], sim: dict) -> str:
     """Gera relatório em texto formatado."""
     lines = []
@@ -537,8 +754,8 @@ def gerar_relatorio_texto(imoveis: list[Imovel], sim: dict) -> str:
     w(f"💰 SIMULAÇÃO FINANCEIRA (30 ANOS COM CICLOS ECONÔMICOS)")
     w(f"{'='*75}")
     w(f"\n  Imóvel: R$ {p['preco_imovel']:,.0f} | Entrada {p['entrada_pct']*100:.0f}%: R$ {p['entrada_valor']:,.0f}")
-    w(f"  Financiamento: R$ {p['financiado']:,.0f} a {p['taxa_financ']*100:.0f}% a.a.")
-    w(f"  Parcela: R$ {p['parcela']:,.0f}/mês | Amortização extra: R$ {p['amort_extra_valor']:,.0f}/mês")
+    w(f"  Financiamento: R$ {p['financiado']:,.0f} a {p['taxa_financ']*100:.0f}% a.a. ({SISTEMAS[p['sistema']]})")
+    w(f"  {rotulo_parcela(p)}: R$ {p['parcela']:,.0f}/mês | Amortização extra: R$ {p['amort_extra_valor']:,.0f}/mês")
     w(f"  Orçamento mensal: R$ {p['orcamento_mensal']:,.0f} (igual para todos os cenários)")
     w(f"  Aluguel inicial: R$ {p['aluguel_inicial']:,.0f}/mês")
     w(f"\n  Médias projetadas: Selic {m['selic_media']:.1f}% | IPCA {m['ipca_medio']:.1f}% | Juros real {m['juros_real_medio']:.1f}%")
@@ -549,13 +766,16 @@ def gerar_relatorio_texto(imoveis: list[Imovel], sim: dict) -> str:
     for h in sim["historico_anual"]:
         if h["ano"] in [1, 3, 5, 8, 10, 12, 15, 20, 25, 30]:
             sd = f"R$ {h['saldo_com']:>8,.0f}" if h["saldo_com"] > 0 else "  QUITADO"
-            w(f"{h['ano']:>4} | {h['ipca']:>4.1f}% | {h['selic']:>4.1f}% | R$ {h['aluguel']:>6,.0f} | R$ {p['parcela']:>6,.0f} | {sd:>11} | R$ {h['patrim_inquilino']:>10,.0f}")
+            w(f"{h['ano']:>4} | {h['ipca']:>4.1f}% | {h['selic']:>4.1f}% | R$ {h['aluguel']:>6,.0f} | R$ {h['parcela']:>6,.0f} | {sd:>11} | R$ {h['patrim_inquilino']:>10,.0f}")
 
     w(f"\n── RESULTADO FINAL ──")
     w(f"  Financiamento quitado em: {r['anos_quitou']:.1f} anos ({r['meses_quitou']} meses)")
     w(f"  Economia de juros com amortização: R$ {r['economia_juros']:,.0f}")
     w(f"  Aluguel ultrapassa parcela no: Ano {r['crossover_ano']}")
-    w(f"  Aluguel final: R$ {r['aluguel_final']:,.0f}/mês vs Parcela: R$ {r['parcela_fixa']:,.0f}/mês")
+    if p["sistema"] == "sac":
+        w(f"  Aluguel final: R$ {r['aluguel_final']:,.0f}/mês vs Última parcela: R$ {sim['historico_anual'][-1]['parcela']:,.0f}/mês")
+    else:
+        w(f"  Aluguel final: R$ {r['aluguel_final']:,.0f}/mês vs Parcela: R$ {r['parcela_fixa']:,.0f}/mês")
 
     w(f"\n{'='*75}")
     w(f"🏆 RANKING PATRIMONIAL (30 ANOS)")
@@ -642,7 +862,8 @@ def gerar_readme(imoveis: list[Imovel], sim: dict, date: str) -> str:
     w(f"| Entrada | {p['entrada_pct']*100:.0f}% ({brl(p['entrada_valor'])}) |")
     w(f"| Financiado | {brl(p['financiado'])} |")
     w(f"| Taxa financ. | {p['taxa_financ']*100:.0f}% a.a. |")
-    w(f"| Parcela | {brl(p['parcela'])}/mes |")
+    w(f"| Sistema | {SISTEMAS[p['sistema']]} |")
+    w(f"| {'Parcela inicial' if p['sistema'] == 'sac' else 'Parcela'} | {brl(p['parcela'])}/mes |")
     w(f"| Amort. extra | {brl(p['amort_extra_valor'])}/mes |")
     w(f"| Orcamento mensal | {brl(p['orcamento_mensal'])}/mes |")
     w(f"| Aluguel inicial | {brl(p['aluguel_inicial'])}/mes |")
@@ -700,12 +921,288 @@ def gerar_readme(imoveis: list[Imovel], sim: dict, date: str) -> str:
     return "\n".join(lines)
 
 
+# ─────────────────────────────────────────────────────────────
+# Export
+# ─────────────────────────────────────────────────────────────
+
+FORMATOS = ["texto", "csv", "json", "ndjson", "readme"]
+
+
+def montar_dados(imoveis: list[Imovel], sim: dict, resumo: Resumo,
+                 date: str, generated_at: str) -> dict:
+    """Payload completo publicado em docs/data/ e exportado como json."""
+    return {
+        "date": date,
+        "generated_at": generated_at,
+        "imoveis": [i.to_dict() for i in imoveis],
+        "simulacao": sim,
+        "resumo": resumo.to_dict(),
+    }
+
+
+def renderizar(formato: str, imoveis: list[Imovel], sim: dict, full_data: dict) -> str:
+    """Renderiza um formato de saída a partir do resultado já calculado."""
+    if formato == "json":
+        return json.dumps(full_data, indent=2, ensure_ascii=False)
+    if formato == "ndjson":
+        return "".join(json.dumps(d, ensure_ascii=False) + "\n" for d in full_data["imoveis"])
+    if formato == "csv":
+        return gerar_csv(imoveis, sim)
+    if formato == "readme":
+        return gerar_readme(imoveis, sim, full_data["date"])
+    return gerar_relatorio_texto(imoveis, sim)
+
+
+def parse_exportar(valor: str) -> tuple[str, str]:
+    """Converte `FORMATO=ARQUIVO` (ARQUIVO `-` = stdout) para o argparse."""
+    formato, sep, caminho = valor.partition("=")
+    if formato not in FORMATOS or not sep or not caminho:
+        raise argparse.ArgumentTypeError(
+            f"esperado FORMATO=ARQUIVO com FORMATO em {', '.join(FORMATOS)}: {valor!r}")
+    return formato, caminho
+
+
+def exportar(alvos: list[tuple[str, str]], imoveis: list[Imovel], sim: dict, full_data: dict):
+    """Renderiza cada formato uma única vez e grava em todos os destinos."""
+    saidas = {f: renderizar(f, imoveis, sim, full_data) for f in dict.fromkeys(f for f, _ in alvos)}
+    for formato, caminho in alvos:
+        if caminho != "-":
+            Path(caminho).write_text(saidas[formato], encoding="utf-8")
+            print(f"  Exportado ({formato}): {caminho}")
+    for formato, caminho in alvos:
+        if caminho == "-":
+            print(saidas[formato])
+
+
+# ─────────────────────────────────────────────────────────────
+# Profiling
+# ─────────────────────────────────────────────────────────────
+
+@dataclass
+class Etapa:
+    nome: str
+    tempo: float  # s, relógio
+    cpu: float  # s, process_time
+    pico_mem: int  # bytes, pico do tracemalloc durante a etapa
+    stats: pstats.Stats
+
+
+class Perfilador:
+    """
+    Perfil por etapa do pipeline: um cProfile e um pico de tracemalloc para
+    cada bloco `with perfil.etapa(nome)`. Inativo, `etapa` não faz nada.
+
+    Só o processo principal é perfilado: o pool do --backfill aparece como espera.
+    """
+
+    def __init__(self, prefixo: Optional[str] = None):
+        self.prefixo = prefixo
+        self.etapas: list[Etapa] = []
+        if self.ativo:
+            tracemalloc.start()
+
+    @property
+    def ativo(self) -> bool:
+        return self.prefixo is not None
+
+    @contextlib.contextmanager
+    def etapa(self, nome: str):
+        if not self.ativo:
+            yield
+            return
+        prof = cProfile.Profile()
+        tracemalloc.reset_peak()
+        t0, c0 = time.perf_counter(), time.process_time()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            tempo, cpu = time.perf_counter() - t0, time.process_time() - c0
+            _, pico = tracemalloc.get_traced_memory()
+            self.etapas.append(Etapa(nome, tempo, cpu, pico, pstats.Stats(prof)))
+
+    def salvar(self):
+        """Grava <prefixo>.prof (pstats) e <prefixo>.folded (flamegraph) e imprime o resumo."""
+        if not self.ativo or not self.etapas:
+            return
+        tracemalloc.stop()
+        total = pstats.Stats()
+        total.add(*(e.stats for e in self.etapas))
+        total.dump_stats(f"{self.prefixo}.prof")
+        with open(f"{self.prefixo}.folded", "w", encoding="utf-8") as f:
+            for e in self.etapas:
+                for pilha, us in pilhas_colapsadas(e.stats, e.nome):
+                    f.write(f"{pilha} {us}\n")
+
+        out = sys.stderr
+        print(f"\n⏱  PERFIL POR ETAPA", file=out)
+        print(f"{'Etapa':<12} | {'Tempo':>8} | {'CPU':>8} | {'Pico mem':>9} | {'Função mais cara (tottime)':<40}", file=out)
+        print(f"{'─'*12}-+-{'─'*8}-+-{'─'*8}-+-{'─'*9}-+-{'─'*40}", file=out)
+        for e in self.etapas:
+            print(f"{e.nome:<12} | {e.tempo:>7.3f}s | {e.cpu:>7.3f}s | {e.pico_mem / 2**20:>7.1f}MB | "
+                  f"{_mais_cara(e.stats):<40}", file=out)
+        print(f"\n  Estatísticas: {self.prefixo}.prof (python3 -m pstats {self.prefixo}.prof; sort cumtime)", file=out)
+        print(f"  Pilhas colapsadas: {self.prefixo}.folded (flamegraph.pl {self.prefixo}.folded > perfil.svg)", file=out)
+
+
+def _rotulo(func: tuple) -> str:
+    arquivo, linha, nome = func
+    rotulo = nome if arquivo == "~" else f"{nome} ({os.path.basename(arquivo)}:{linha})"
+    return rotulo.replace(";", ",")
+
+
+def _mais_cara(stats: pstats.Stats) -> str:
+    if not stats.stats:
+        return "-"
+    func, (_, _, tt, _, _) = max(stats.stats.items(), key=lambda kv: kv[1][2])
+    return f"{tt:.3f}s {_rotulo(func)}"[:40]
+
+
+def pilhas_colapsadas(stats: pstats.Stats, raiz: str, profundidade: int = 64) -> Iterator[tuple[str, int]]:
+    """
+    Reconstrói pilhas no formato colapsado (`a;b;c µs`) a partir do grafo
+    chamador→chamado do cProfile. O tempo de uma função chamada por vários
+    chamadores é dividido na proporção do cumtime de cada aresta.
+    """
+    filhos: dict[tuple, list[tuple[tuple, float]]] = {}
+    for func, (_, _, _, _, chamadores) in stats.stats.items():
+        for chamador, (_, _, _, ct) in chamadores.items():
+            filhos.setdefault(chamador, []).append((func, ct))
+    raizes = [f for f, (_, _, _, _, chamadores) in stats.stats.items() if not chamadores]
+
+    def visitar(func: tuple, pilha: list[str], fracao: float, vistos: set):
+        _, _, tt, ct, _ = stats.stats[func]
+        pilha = pilha + [_rotulo(func)]
+        us = round(tt * fracao * 1e6)
+        if us > 0:
+            yield ";".join(pilha), us
+        if len(pilha) >= profundidade:
+            return
+        for filho, ct_aresta in filhos.get(func, []):
+            ct_filho = stats.stats[filho][3]
+            if filho in vistos or ct_filho <= 0:
+                continue
+            yield from visitar(filho, pilha, fracao * ct_aresta / ct_filho, vistos | {filho})
+
+    for func in raizes:
+        yield from visitar(func, [raiz], 1.0, {func})
+
+
 # ─────────────────────────────────────────────────────────────
 # Main
 # ─────────────────────────────────────────────────────────────
 
+def gravar_atomico(path: Path, texto: str) -> bool:
+    """Grava via arquivo temporário + os.replace; não toca arquivos já idênticos."""
+    if path.exists() and path.read_text(encoding="utf-8") == texto:
+        return False
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(texto, encoding="utf-8")
+    os.replace(tmp, path)
+    return True
+
+
+HISTORICO_POR_PAGINA = 52  # ~1 ano de coletas semanais por página de history
+
+
+def _slug(texto: str) -> str:
+    ascii_ = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "-", ascii_.lower()).strip("-")
+
+
+def publicar_shards(data: dict, destino: Path) -> bool:
+    """
+    Divide um snapshot em docs/data/<data>/: um shard por (tipo, fonte),
+    simulacao.json e um manifest.json pequeno que lista os shards.
+    Retorna True se algum arquivo mudou.
+    """
+    destino.mkdir(parents=True, exist_ok=True)
+    compacto = dict(ensure_ascii=False, separators=(",", ":"))
+    grupos: dict[tuple[str, str], list[dict]] = {}
+    for d in data["imoveis"]:
+        grupos.setdefault((d["tipo"], d["fonte"]), []).append(d)
+
+    alterado = False
+    shards = []
+    for (tipo, fonte), itens in sorted(grupos.items()):
+        arquivo = f"{tipo}-{_slug(fonte)}.json"
+        alterado |= gravar_atomico(destino / arquivo, json.dumps(itens, **compacto))
+        shards.append({"tipo": tipo, "fonte": fonte, "arquivo": arquivo, "total": len(itens)})
+    alterado |= gravar_atomico(destino / "simulacao.json", json.dumps(data["simulacao"], **compacto))
+    manifest = {
+        "date": data["date"],
+        "generated_at": data["generated_at"],
+        "resumo": data["resumo"],
+        "simulacao": "simulacao.json",
+        "shards": shards,
+    }
+    alterado |= gravar_atomico(destino / "manifest.json", json.dumps(manifest, indent=2, ensure_ascii=False))
+
+    # Shards de fontes que sumiram numa nova coleta do mesmo dia
+    validos = {s["arquivo"] for s in shards} | {"simulacao.json", "manifest.json"}
+    for f in destino.glob("*.json"):
+        if f.name not in validos:
+            f.unlink()
+            alterado = True
+    return alterado
+
+
+def ler_historico(docs: Path) -> list[dict]:
+    """
+    Todas as entradas de history.json (paginado ou lista antiga), mais recente
+    primeiro. Uma página ilegível levanta erro: o histórico é regravado em
+    seguida, e recomeçar do zero apagaria as páginas antigas.
+    """
+    history_file = docs / "history.json"
+    if not history_file.exists():
+        return []
+    try:
+        pagina = json.loads(history_file.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, ValueError):
+        if (docs / "history").is_dir():
+            raise
+        return []  # history.json antigo (arquivo único) corrompido: recomeça
+    if isinstance(pagina, list):
+        return pagina
+    entradas = list(pagina["itens"])
+    total = pagina.get("total")
+    while pagina.get("anterior"):
+        pagina = json.loads((docs / pagina["anterior"]).read_text(encoding="utf-8"))
+        entradas += pagina["itens"]
+    if total is not None and len(entradas) != total:
+        raise ValueError(f"{history_file}: {len(entradas)} entradas lidas, esperado {total}")
+    return entradas
+
+
+def gravar_historico(docs: Path, history: list[dict], por_pagina: int = HISTORICO_POR_PAGINA):
+    """
+    Pagina o histórico (mais recente primeiro). As páginas são contadas a
+    partir da coleta mais antiga, então só a mais nova muda a cada execução:
+    ela fica em history.json e aponta para history/<n>.json via `anterior`.
+    """
+    cronologico = history[::-1]
+    paginas = [cronologico[i:i + por_pagina] for i in range(0, len(cronologico), por_pagina)] or [[]]
+    pasta = docs / "history"
+    if len(paginas) > 1:
+        pasta.mkdir(exist_ok=True)
+    for n, itens in enumerate(paginas, start=1):
+        pagina = {"pagina": n, "itens": itens[::-1], "anterior": f"history/{n - 1}.json" if n > 1 else None}
+        if n == len(paginas):
+            pagina.update(paginas=len(paginas), total=len(history))
+            gravar_atomico(docs / "history.json", json.dumps(pagina, indent=2, ensure_ascii=False))
+        else:
+            gravar_atomico(pasta / f"{n}.json", json.dumps(pagina, indent=2, ensure_ascii=False))
+    for f in pasta.glob("*.json"):
+        if not f.stem.isdigit() or int(f.stem) >= len(paginas):
+            f.unlink()
+
+
 def publish_to_docs(data: dict, imoveis: list[Imovel], sim: dict, docs_dir: str) -> str:
-    """Save JSON to docs/data/YYYY-MM-DD.json, copy to latest.json, update history.json, generate README.md."""
+    """
+    Save JSON to docs/data/YYYY-MM-DD.json plus its shards in docs/data/YYYY-MM-DD/,
+    copy to latest.json, update the paginated history.json, generate README.md.
+    """
     docs = Path(docs_dir)
     data_dir = docs / "data"
     data_dir.mkdir(parents=True, exist_ok=True)
@@ -713,40 +1210,113 @@ def publish_to_docs(data: dict, imoveis: list[Imovel], sim: dict, docs_dir: str)
     today = datetime.now().strftime("%Y-%m-%d")
     data_file = data_dir / f"{today}.json"
     latest_file = docs / "latest.json"
-    history_file = docs / "history.json"
 
     # Write dated file
     json_str = json.dumps(data, indent=2, ensure_ascii=False)
-    data_file.write_text(json_str, encoding="utf-8")
+    gravar_atomico(data_file, json_str)
     print(f"  Salvo: {data_file}")
 
+    # Shards por tipo/fonte + manifest, carregados sob demanda pelo dashboard
+    publicar_shards(data, data_dir / today)
+    print(f"  Salvo: {data_dir / today / 'manifest.json'}")
+
     # Copy to latest.json
-    latest_file.write_text(json_str, encoding="utf-8")
+    gravar_atomico(latest_file, json_str)
     print(f"  Atualizado: {latest_file}")
 
-    # Update history.json
-    history = []
-    if history_file.exists():
-        try:
-            history = json.loads(history_file.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, ValueError):
-            history = []
-
-    # Remove existing entry for today (re-run)
-    history = [h for h in history if h.get("date") != today]
-    history.insert(0, {"date": today, "file": f"data/{today}.json"})
-    history_file.write_text(json.dumps(history, indent=2, ensure_ascii=False), encoding="utf-8")
-    print(f"  Atualizado: {history_file}")
+    # Update history.json (remove existing entry for today on re-run)
+    history = [h for h in ler_historico(docs) if h.get("date") != today]
+    history.insert(0, {"date": today, "file": f"data/{today}.json", "manifest": f"data/{today}/manifest.json"})
+    gravar_historico(docs, history)
+    print(f"  Atualizado: {docs / 'history.json'}")
 
     # Generate README.md at repo root (one level above docs/)
     readme_path = docs.parent / "README.md"
     readme_content = gerar_readme(imoveis, sim, today)
-    readme_path.write_text(readme_content, encoding="utf-8")
+    gravar_atomico(readme_path, readme_content)
     print(f"  Atualizado: {readme_path}")
 
     return str(data_file)
 
 
+# ─────────────────────────────────────────────────────────────
+# Backfill
+# ─────────────────────────────────────────────────────────────
+
+def rederivar_snapshot(data_file: str) -> tuple[dict, list[Imovel], dict]:
+    """Recalcula `simulacao` e `resumo` de um snapshot a partir dos `imoveis` salvos."""
+    antigo = json.loads(Path(data_file).read_text(encoding="utf-8"))
+    imoveis = [Imovel.from_dict(d) for d in antigo["imoveis"]]
+    p = antigo["simulacao"]["parametros"]
+    sim = simular(
+        preco=p["preco_imovel"],
+        aluguel_ini=p["aluguel_inicial"],
+        entrada_pct=p["entrada_pct"],
+        taxa_financ=p["taxa_financ"],
+        amort_extra_pct=p["amort_extra_pct"],
+        sistema=p.get("sistema", "price"),
+    )
+    resumo = Resumo()
+    for _ in resumo.contar(imoveis):
+        pass
+    return montar_dados(imoveis, sim, resumo, antigo["date"], antigo["generated_at"]), imoveis, sim
+
+
+def _backfill_snapshot(data_file: str) -> tuple[Optional[bool], Optional[dict], str]:
+    """
+    Tarefa do pool: regrava o snapshot e seus shards se o derivado mudou.
+    Retorna (alterado, dados, erro); snapshot ilegível volta com alterado None.
+    """
+    try:
+        data, _, _ = rederivar_snapshot(data_file)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        return None, None, f"{type(e).__name__}: {e}"
+    alterado = gravar_atomico(Path(data_file), json.dumps(data, indent=2, ensure_ascii=False))
+    alterado = publicar_shards(data, Path(data_file).with_suffix("")) or alterado
+    return alterado, data, ""
+
+
+def backfill(docs_dir: str, processos: Optional[int] = None):
+    """Re-renderiza todos os snapshots de history.json em paralelo, além de latest.json e README.md."""
+    docs = Path(docs_dir)
+    history = ler_historico(docs)
+    arquivos = {}
+    for h in history:
+        data_file = docs / h["file"]
+        if data_file.exists():
+            arquivos[str(data_file)] = h
+        else:
+            print(f"  [AVISO] {data_file} não encontrado, ignorando")
+
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        resultados = list(pool.map(_backfill_snapshot, arquivos, chunksize=max(1, len(arquivos) // 64)))
+    falhas = 0
+    for (data_file, h), (alterado, _, erro) in zip(arquivos.items(), resultados):
+        if alterado is None:
+            falhas += 1
+            print(f"  [ERRO] {data_file}: {erro}")
+            continue
+        h["manifest"] = f"{Path(h['file']).with_suffix('').as_posix()}/manifest.json"
+        print(f"  {'Atualizado' if alterado else 'Em dia'}: {data_file}")
+    print(f"\n  {sum(bool(r[0]) for r in resultados)} de {len(arquivos)} snapshots re-renderizados"
+          + (f", {falhas} com erro" if falhas else ""))
+    gravar_historico(docs, history)
+
+    if not resultados:
+        return
+    # latest.json e README.md refletem o snapshot mais recente
+    _, data, _ = resultados[0]
+    if data is None:
+        print("  [AVISO] snapshot mais recente com erro; latest.json e README.md mantidos")
+        return
+    if gravar_atomico(docs / "latest.json", json.dumps(data, indent=2, ensure_ascii=False)):
+        print(f"  Atualizado: {docs / 'latest.json'}")
+    imoveis = [Imovel.from_dict(d) for d in data["imoveis"]]
+    readme_path = docs.parent / "README.md"
+    if gravar_atomico(readme_path, gerar_readme(imoveis, data["simulacao"], data["date"])):
+        print(f"  Atualizado: {readme_path}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Relatório Aluguel vs Compra — Bom Pastor, Divinópolis/MG")
     parser.add_argument("--preco", type=float, default=500000, help="Preço do imóvel (default: 500000)")
@@ -754,56 +1324,100 @@ def main():
     parser.add_argument("--entrada", type=float, default=0.30, help="Percentual de entrada (default: 0.30)")
     parser.add_argument("--juros", type=float, default=0.10, help="Taxa de financiamento anual (default: 0.10)")
     parser.add_argument("--amortizacao", type=float, default=0.5, help="Amortização extra como fração da parcela (default: 0.5)")
-    parser.add_argument("--export", choices=["texto", "csv", "json"], default="texto", help="Formato de saída")
+    parser.add_argument("--sistema", choices=list(SISTEMAS), default="price", help="Sistema de amortização (default: price)")
+    parser.add_argument("--export", choices=FORMATOS, default=None,
+                        help="Formato de saída (default: texto; ndjson: um imóvel por linha, gravado à medida que é coletado)")
+    parser.add_argument("--exportar", type=parse_exportar, action="append", default=[], metavar="FORMATO=ARQUIVO",
+                        help="Exporta vários formatos numa só coleta (repetível; ARQUIVO '-' = stdout). Ex.: --exportar csv=a.csv --exportar texto=a.txt")
     parser.add_argument("--no-scrape", action="store_true", help="Pular scraping (usar só simulação)")
     parser.add_argument("--output", type=str, default=None, help="Arquivo de saída (default: stdout)")
     parser.add_argument("--docs-dir", type=str, default=None,
                         help="Publish JSON to docs/ directory (e.g. ../docs). Creates data/YYYY-MM-DD.json, latest.json, history.json")
+    parser.add_argument("--backfill", action="store_true",
+                        help="Recalcula simulacao/resumo de todos os snapshots de --docs-dir a partir dos imoveis salvos")
+    parser.add_argument("--processos", type=int, default=None, help="Processos do --backfill (default: nº de CPUs)")
+    parser.add_argument("--profile", nargs="?", const="perfil", default=None, metavar="PREFIXO",
+                        help="Perfila cada etapa (cProfile + tracemalloc); grava PREFIXO.prof e PREFIXO.folded (default: perfil)")
     args = parser.parse_args()
+    if args.backfill and not args.docs_dir:
+        parser.error("--backfill requer --docs-dir")
+
+    perfil = Perfilador(args.profile)
+    try:
+        executar(args, perfil)
+    finally:
+        perfil.salvar()
+
+
+def executar(args: argparse.Namespace, perfil: Perfilador):
+    """Roda o pipeline escolhido pelos argumentos, marcando as etapas em `perfil`."""
+    if args.backfill:
+        print(f"\nRe-renderizando snapshots de {args.docs_dir}...\n")
+        with perfil.etapa("backfill"):
+            backfill(args.docs_dir, args.processos)
+        return
 
-    # Scraping
+    if args.export is None and not args.exportar:
+        args.export = "texto"
+
+    # Scraping (gerador: nada é baixado até alguém consumir)
+    resumo = Resumo()
     if args.no_scrape:
-        imoveis = []
+        imoveis = iter([])
         print("Scraping pulado (--no-scrape)")
     else:
-        imoveis = scrape_todos()
+        imoveis = coletar(resumo)
+
+    # NDJSON sem docs/: grava cada imóvel assim que é lido, sem materializar a lista.
+    # O progresso vai para stderr para não se misturar às linhas no stdout.
+    if args.export == "ndjson" and not args.docs_dir and not args.exportar:
+        with contextlib.ExitStack() as stack:
+            out = stack.enter_context(open(args.output, "w", encoding="utf-8")) if args.output else sys.stdout
+            stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+            stack.enter_context(perfil.etapa("scraping"))
+            escrever_ndjson(imoveis, out, flush=not args.output)
+            resumo.imprimir()
+            if args.output:
+                print(f"\nRelatorio salvo em: {args.output}")
+        return
+
+    with perfil.etapa("scraping"):
+        imoveis = list(imoveis)
+    if not args.no_scrape:
+        resumo.imprimir()
 
     # Simulação
     print("\nExecutando simulacao financeira...\n")
-    sim = simular(
-        preco=args.preco,
-        aluguel_ini=args.aluguel,
-        entrada_pct=args.entrada,
-        taxa_financ=args.juros,
-        amort_extra_pct=args.amortizacao,
-    )
+    with perfil.etapa("simulacao"):
+        sim = simular(
+            preco=args.preco,
+            aluguel_ini=args.aluguel,
+            entrada_pct=args.entrada,
+            taxa_financ=args.juros,
+            amort_extra_pct=args.amortizacao,
+            sistema=args.sistema,
+        )
 
     # Build full data payload
-    full_data = {
-        "date": datetime.now().strftime("%Y-%m-%d"),
-        "generated_at": datetime.now().isoformat(),
-        "imoveis": [i.to_dict() for i in imoveis],
-        "simulacao": sim,
-        "resumo": {
-            "total_imoveis": len(imoveis),
-            "total_venda": len([i for i in imoveis if i.tipo == "venda"]),
-            "total_aluguel": len([i for i in imoveis if i.tipo == "aluguel"]),
-            "fontes": list(set(i.fonte for i in imoveis)),
-        },
-    }
+    with perfil.etapa("payload"):
+        full_data = montar_dados(imoveis, sim, resumo,
+                                 datetime.now().strftime("%Y-%m-%d"), datetime.now().isoformat())
 
     # Publish to docs/ if requested
     if args.docs_dir:
         print("\nPublicando em docs/...")
-        publish_to_docs(full_data, imoveis, sim, args.docs_dir)
+        with perfil.etapa("publicacao"):
+            publish_to_docs(full_data, imoveis, sim, args.docs_dir)
 
     # Output
-    if args.export == "json":
-        output = json.dumps(full_data, indent=2, ensure_ascii=False)
-    elif args.export == "csv":
-        output = gerar_csv(imoveis, sim)
-    else:
-        output = gerar_relatorio_texto(imoveis, sim)
+    if args.exportar:
+        print("\nExportando...")
+        with perfil.etapa("exportacao"):
+            exportar(args.exportar, imoveis, sim, full_data)
+    if args.export is None:
+        return
+    with perfil.etapa("renderizacao"):
+        output = renderizar(args.export, imoveis, sim, full_data)
 
     if args.output:
         with open(args.output, "w", encoding="utf-8") as f:
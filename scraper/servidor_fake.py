@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Servidor local que imita as imobiliárias usadas por relatorio_imoveis.py.
+
+Emula o endpoint JSON `/imoveis/ajax/` da plataforma Ala/Achei e as páginas
+HTML de listagem da Francisco e da MGF, com volume, paginação, latência e
+falhas configuráveis. Os imóveis são gerados de forma determinística a partir
+da semente, sem manter nada em memória entre requisições.
+
+Uso:
+    python3 servidor_fake.py --porta 8765 --imoveis 5000
+    python3 servidor_fake.py --imoveis 20000 --por-pagina 500 --latencia 80 --erro 0.05
+    python3 servidor_fake.py --lento 0.1 --atraso-lento 3000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import urllib.parse
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+RUAS = ["Rua Candidés", "Avenida Getúlio Vargas", "Rua Pernambuco", "Rua Goiás",
+        "Rua Itapecerica", "Rua Rio de Janeiro", "Avenida Paraná", "Rua Mato Grosso"]
+
+
+@dataclass
+class Config:
+    imoveis: int = 50  # por fonte e finalidade
+    por_pagina: Optional[int] = None  # None: respeita o que o cliente pedir
+    latencia: float = 0.0  # ms por requisição
+    jitter: float = 0.0  # ms, somado uniformemente à latência
+    erro: float = 0.0  # fração de respostas HTTP 500
+    lento: float = 0.0  # fração de respostas lentas
+    atraso_lento: float = 2000.0  # ms extras nas respostas lentas
+    seed: int = 42
+
+
+# ─────────────────────────────────────────────────────────────
+# Geração de imóveis
+# ─────────────────────────────────────────────────────────────
+
+def gerar_imovel(config: Config, fonte: str, finalidade: str, idx: int) -> dict:
+    """Imóvel sintético estável para (semente, fonte, finalidade, índice)."""
+    rnd = random.Random(f"{config.seed}:{fonte}:{finalidade}:{idx}")
+    area = rnd.randint(45, 600)
+    if finalidade == "aluguel":
+        preco = rnd.randint(10, 90) * 100
+    else:
+        preco = rnd.randint(15, 300) * 5000
+    return {
+        "tipo": "Casa" if rnd.random() < 0.85 else "Apartamento",
+        "area": area,
+        "quartos": rnd.randint(1, 6),
+        "banheiros": rnd.randint(1, 5),
+        "vagas": rnd.randint(1, 6),
+        "preco": preco,
+        "endereco": rnd.choice(RUAS),
+    }
+
+
+def pagina(config: Config, fonte: str, finalidade: str,
+           numero: int, registros: int) -> list[dict]:
+    if config.por_pagina:
+        registros = config.por_pagina
+    inicio = max(numero - 1, 0) * registros
+    fim = min(inicio + registros, config.imoveis)
+    return [gerar_imovel(config, fonte, finalidade, i) for i in range(inicio, fim)]
+
+
+def milhar(v: int) -> str:
+    return f"{v:,}".replace(",", ".")
+
+
+# ─────────────────────────────────────────────────────────────
+# Renderização por fonte
+# ─────────────────────────────────────────────────────────────
+
+def render_ajax(itens: list[dict], total: int) -> bytes:
+    """Resposta da plataforma Ala/Achei (`lista` + `quantidade`)."""
+    lista = [{
+        "tipo": i["tipo"],
+        "valor": f"R$ {milhar(i['preco'])},00",
+        "areaprincipal": f"{i['area']},00",
+        "numeroquartos": str(i["quartos"]),
+        "numerobanhos": str(i["banheiros"]),
+        "numerovagas": str(i["vagas"]),
+        "endereco": i["endereco"],
+    } for i in itens]
+    return json.dumps({"quantidade": total, "lista": lista}, ensure_ascii=False).encode("utf-8")
+
+
+def render_francisco(itens: list[dict]) -> bytes:
+    cards = "\n".join(
+        f'<div class="card-imovel"><h3>Casa</h3>'
+        f'<p>{i["area"]} m²</p><p>{i["quartos"]} quartos</p>'
+        f'<p>{i["vagas"]} vagas</p><p>R$ {milhar(i["preco"])}</p></div>'
+        for i in itens if i["tipo"] == "Casa"
+    )
+    return f"<html><body><main>\n{cards}\n</main></body></html>".encode("utf-8")
+
+
+def render_mgf(itens: list[dict]) -> bytes:
+    cards = "\n".join(
+        f'<div class="card"><span>{i["area"]} m²</span>'
+        f'<span>{i["quartos"]} quartos</span><span>{i["banheiros"]} banheiros</span>'
+        f'<span>{i["vagas"]} vagas</span><span>R$ {milhar(i["preco"])}</span></div>'
+        for i in itens if i["tipo"] == "Casa"
+    )
+    return f"<html><body><section>\n{cards}\n</section></body></html>".encode("utf-8")
+
+
+# ─────────────────────────────────────────────────────────────
+# HTTP
+# ─────────────────────────────────────────────────────────────
+
+class Handler(BaseHTTPRequestHandler):
+    config: Config = Config()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _atrasar_ou_falhar(self) -> bool:
+        """Aplica latência/lentidão; retorna False se a resposta deve falhar."""
+        c = self.config
+        atraso = c.latencia + (random.uniform(0, c.jitter) if c.jitter else 0)
+        if c.lento and random.random() < c.lento:
+            atraso += c.atraso_lento
+        if atraso:
+            time.sleep(atraso / 1000)
+        if c.erro and random.random() < c.erro:
+            self._responder(500, b"erro simulado", "text/plain")
+            return False
+        return True
+
+    def _responder(self, status: int, corpo: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_POST(self):
+        partes = self.path.strip("/").split("/")
+        tamanho = int(self.headers.get("Content-Length", 0))
+        form = urllib.parse.parse_qs(self.rfile.read(tamanho).decode("utf-8"))
+        if len(partes) != 3 or partes[0] not in ("ala", "achei") or partes[1:] != ["imoveis", "ajax"]:
+            self._responder(404, b"{}", "application/json")
+            return
+        if not self._atrasar_ou_falhar():
+            return
+        campo = lambda k, d: form.get(f"imovel[{k}]", [d])[0]
+        finalidade = campo("finalidade", "venda")
+        itens = pagina(self.config, partes[0], finalidade,
+                       int(campo("numeropagina", "1")), int(campo("numeroregistros", "50")))
+        self._responder(200, render_ajax(itens, self.config.imoveis), "application/json")
+
+    def do_GET(self):
+        partes = self.path.strip("/").split("/")
+        # /francisco/imoveis/<comprar|alugar>/casa/divinopolis/bom-pastor/<pagina>
+        if len(partes) == 7 and partes[0] == "francisco" and partes[2] in ("comprar", "alugar"):
+            finalidade = "venda" if partes[2] == "comprar" else "aluguel"
+            numero = int(partes[6]) if partes[6].isdigit() else 1
+            render, fonte = render_francisco, "francisco"
+        # /mgf/<venda|aluguel>/casa/mg-divinopolis-bom-pastor
+        elif len(partes) == 4 and partes[0] == "mgf" and partes[1] in ("venda", "aluguel"):
+            finalidade, numero = partes[1], 1
+            render, fonte = render_mgf, "mgf"
+        else:
+            self._responder(404, b"nao encontrado", "text/plain")
+            return
+        if not self._atrasar_ou_falhar():
+            return
+        itens = pagina(self.config, fonte, finalidade, numero, self.config.imoveis)
+        self._responder(200, render(itens), "text/html")
+
+
+def urls_locais(base: str) -> dict:
+    """URLs para sobrescrever `relatorio_imoveis.URLS` apontando para `base`."""
+    base = base.rstrip("/")
+    return {
+        "ala": f"{base}/ala/imoveis/ajax/",
+        "achei": f"{base}/achei/imoveis/ajax/",
+        "francisco": f"{base}/francisco/imoveis/{{tipo_url}}/casa/divinopolis/bom-pastor/1/",
+        "mgf": f"{base}/mgf/{{finalidade}}/casa/mg-divinopolis-bom-pastor",
+    }
+
+
+def criar_servidor(config: Config, porta: int = 0, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    handler = type("ConfiguredHandler", (Handler,), {"config": config})
+    servidor = ThreadingHTTPServer((host, porta), handler)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def add_config_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--imoveis", type=int, default=50, help="Imóveis por fonte e finalidade (default: 50)")
+    parser.add_argument("--por-pagina", type=int, default=None, help="Força o tamanho da página (default: o pedido pelo cliente)")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Latência base por requisição em ms (default: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variação uniforme extra de latência em ms (default: 0)")
+    parser.add_argument("--erro", type=float, default=0.0, help="Fração de respostas HTTP 500 (default: 0)")
+    parser.add_argument("--lento", type=float, default=0.0, help="Fração de respostas lentas (default: 0)")
+    parser.add_argument("--atraso-lento", type=float, default=2000.0, help="Atraso das respostas lentas em ms (default: 2000)")
+    parser.add_argument("--seed", type=int, default=42, help="Semente dos imóveis gerados (default: 42)")
+
+
+def config_from_args(args: argparse.Namespace) -> Config:
+    return Config(
+        imoveis=args.imoveis, por_pagina=args.por_pagina, latencia=args.latencia,
+        jitter=args.jitter, erro=args.erro, lento=args.lento,
+        atraso_lento=args.atraso_lento, seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor fake das imobiliárias (Ala, Achei, Francisco, MGF)")
+    parser.add_argument("--porta", type=int, default=8765, help="Porta (0 = livre; default: 8765)")
+    add_config_args(parser)
+    args = parser.parse_args()
+
+    servidor = criar_servidor(config_from_args(args), args.porta)
+    host, porta = servidor.server_address[:2]
+    print(f"http://{host}:{porta}", flush=True)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
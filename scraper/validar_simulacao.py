@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Valida `simular()` (forma fechada, ano a ano) contra a simulação de
+referência mês a mês, para Price e SAC, e compara o tempo das duas.
+
+Uso:
+    python3 validar_simulacao.py
+    python3 validar_simulacao.py --repeticoes 2000
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from relatorio_imoveis import HISTORICO, PROJECAO, QUITADO, Financiamento, simular  # noqa: E402
+
+TOLERANCIA = 0.05  # R$, após arredondamento a centavos
+
+
+def simular_mensal(preco: float, aluguel_ini: float, entrada_pct: float,
+                   taxa_financ: float, amort_extra_pct: float, sistema: str = "price") -> dict:
+    """Referência: o laço mês a mês original, estendido ao SAC."""
+    entrada = preco * entrada_pct
+    financiado = preco * (1 - entrada_pct)
+    tx_m = taxa_financ / 12
+    prazo = 360
+    parcela = Financiamento(financiado, tx_m, sistema, prazo).parcela
+    amort_sac = financiado / prazo
+    amort_extra = parcela * amort_extra_pct
+    orcamento = parcela + amort_extra
+
+    dados = HISTORICO + PROJECAO
+
+    saldo_com = financiado
+    patrim_comprador = 0.0
+    total_juros_com = 0.0
+    total_pago_com = entrada
+    meses_quitou = 0
+
+    saldo_sem = financiado
+    total_juros_sem = 0.0
+    prestacao_sem = 0.0
+
+    patrim_inquilino = entrada
+    aluguel = aluguel_ini
+    total_aluguel = 0.0
+
+    imovel_val = preco
+    crossover = None
+    historico_anual = []
+
+    for idx, (year, ipca, selic) in enumerate(dados):
+        ano = idx + 1
+        selic_m = (1 + selic / 100) ** (1 / 12) - 1
+
+        for m in range(12):
+            if saldo_com > QUITADO:
+                juros = saldo_com * tx_m
+                amort_normal = amort_sac if sistema == "sac" else parcela - juros
+                pagamento = amort_normal + juros + amort_extra
+                total_juros_com += juros
+                saldo_com -= (amort_normal + amort_extra)
+                total_pago_com += pagamento
+                patrim_comprador = patrim_comprador * (1 + selic_m) + (orcamento - pagamento)
+                if saldo_com <= QUITADO:
+                    saldo_com = 0
+                    meses_quitou = (ano - 1) * 12 + m + 1
+            else:
+                patrim_comprador = patrim_comprador * (1 + selic_m) + orcamento
+
+            if saldo_sem > QUITADO:
+                juros_sem = saldo_sem * tx_m
+                total_juros_sem += juros_sem
+                amort_sem = amort_sac if sistema == "sac" else (parcela - juros_sem)
+                saldo_sem -= amort_sem
+                prestacao_sem = amort_sem + juros_sem
+            else:
+                prestacao_sem = 0.0
+
+            investimento = orcamento - aluguel
+            patrim_inquilino = patrim_inquilino * (1 + selic_m) + investimento
+            total_aluguel += aluguel
+
+        aluguel *= (1 + ipca / 100)
+        imovel_val *= (1 + ipca / 100)
+
+        if crossover is None and aluguel > prestacao_sem:
+            crossover = ano
+
+        historico_anual.append({
+            "ano": ano, "year": year, "ipca": ipca, "selic": selic,
+            "aluguel": round(aluguel, 2),
+            "parcela": round(prestacao_sem, 2),
+            "saldo_com": round(max(saldo_com, 0), 2),
+            "saldo_sem": round(max(saldo_sem, 0), 2) if saldo_sem > QUITADO else 0.0,
+            "patrim_comprador": round(patrim_comprador, 2),
+            "patrim_inquilino": round(patrim_inquilino, 2),
+            "imovel_val": round(imovel_val, 2),
+        })
+
+    return {
+        "resultado": {
+            "meses_quitou": meses_quitou,
+            "juros_com_amort": round(total_juros_com, 2),
+            "juros_sem_amort": round(total_juros_sem, 2),
+            "crossover_ano": crossover,
+            "patrim_comprador_invest": round(patrim_comprador, 2),
+            "patrim_inquilino": round(patrim_inquilino, 2),
+            "total_pago_aluguel": round(total_aluguel, 2),
+            "total_pago_compra": round(total_pago_com, 2),
+        },
+        "historico_anual": historico_anual,
+    }
+
+
+def diferencas(ref: dict, novo: dict, prefixo: str = "") -> list[str]:
+    """Campos numéricos de `ref` que divergem de `novo` além da tolerância."""
+    erros = []
+    for chave, v in ref.items():
+        caminho = f"{prefixo}{chave}"
+        if isinstance(v, dict):
+            erros += diferencas(v, novo[chave], caminho + ".")
+        elif isinstance(v, list):
+            for i, (a, b) in enumerate(zip(v, novo[chave])):
+                erros += diferencas(a, b, f"{caminho}[{i}].")
+        elif v is None or novo[chave] is None:
+            if v != novo[chave]:
+                erros.append(f"{caminho}: {v} != {novo[chave]}")
+        elif abs(v - novo[chave]) > max(TOLERANCIA, abs(v) * 1e-9):
+            erros.append(f"{caminho}: {v} != {novo[chave]}")
+    return erros
+
+
+def cronometrar(fn, kwargs: dict, repeticoes: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeticoes):
+        fn(**kwargs)
+    return (time.perf_counter() - t0) / repeticoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valida simular() contra a simulação mês a mês")
+    parser.add_argument("--repeticoes", type=int, default=300, help="Execuções por medição de tempo (default: 300)")
+    args = parser.parse_args()
+
+    grade = itertools.product(
+        ["price", "sac"],
+        [300000, 500000, 1200000],    # preço
+        [0.1, 0.3, 0.5, 1.0],         # entrada
+        [0.06, 0.10, 0.14],           # juros
+        [0.0, 0.25, 0.5, 1.0, 3.0],   # amortização extra
+    )
+    casos = falhas = 0
+    for sistema, preco, entrada, juros, amort in grade:
+        kwargs = dict(preco=preco, aluguel_ini=preco * 0.004, entrada_pct=entrada,
+                      taxa_financ=juros, amort_extra_pct=amort, sistema=sistema)
+        erros = diferencas(simular_mensal(**kwargs), simular(**kwargs))
+        casos += 1
+        if erros:
+            falhas += 1
+            print(f"  [DIVERGE] {kwargs}")
+            for e in erros[:5]:
+                print(f"      {e}")
+    print(f"{casos - falhas}/{casos} casos batem com a referência mês a mês")
+
+    print(f"\n{'Sistema':<8} | {'Mês a mês':>10} | {'Forma fechada':>13} | {'Ganho':>6}")
+    print(f"{'─'*8}-+-{'─'*10}-+-{'─'*13}-+-{'─'*6}")
+    for sistema in ["price", "sac"]:
+        kwargs = dict(preco=500000, aluguel_ini=2000, entrada_pct=0.3,
+                      taxa_financ=0.10, amort_extra_pct=0.5, sistema=sistema)
+        t_ref = cronometrar(simular_mensal, kwargs, args.repeticoes)
+        t_novo = cronometrar(simular, kwargs, args.repeticoes)
+        print(f"{sistema:<8} | {t_ref * 1e6:>8.0f}µs | {t_novo * 1e6:>11.0f}µs | {t_ref / t_novo:>5.1f}x")
+
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())